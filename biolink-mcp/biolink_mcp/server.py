@@ -2,14 +2,15 @@ import os
 import json
 from typing import Optional, List
 from fastmcp import FastMCP
-from bmt import Toolkit
 from linkml_runtime.dumpers import json_dumper
+from biolink_mcp.specificity import cached_ancestors, most_specific_types
+from biolink_mcp.toolkit_cache import load_toolkit
 
 mcp = FastMCP("biolink", version="0.1.0")
 
 # Initialize BMT toolkit with optional version from environment variable
 biolink_version = os.getenv("BIOLINK_VERSION")
-toolkit = Toolkit(biolink_version) if biolink_version else Toolkit()
+toolkit = load_toolkit(biolink_version)
 
 
 @mcp.tool()
@@ -30,7 +31,7 @@ def get_ancestors(name: str, formatted: bool = False, mixin: bool = True) -> Lis
         formatted: Whether to return formatted CURIEs
         mixin: Whether to include mixin ancestors
     """
-    return toolkit.get_ancestors(name, formatted=formatted, mixin=mixin)
+    return list(cached_ancestors(toolkit, name, formatted=formatted, mixin=mixin, reflexive=True))
 
 
 @mcp.tool()
@@ -133,27 +134,7 @@ def find_most_specific_types(categories: str | List[str]) -> List[str]:
     if isinstance(categories, str):
         categories = [categories]
 
-    # Handle empty input
-    if not categories:
-        return ['biolink:NamedThing']
-
-    # Find most specific types
-    most_specific = []
-    for biolink_type in categories:
-        is_most_specific = True
-        for other in categories:
-            if other != biolink_type:
-                # Get ancestors with reflexive=True (includes the type itself)
-                ancestors = toolkit.get_ancestors(other, reflexive=True, formatted=True, mixin=True)
-                if ancestors and biolink_type in ancestors:
-                    # biolink_type is an ancestor of other, so it's not most specific
-                    is_most_specific = False
-                    break
-        if is_most_specific:
-            most_specific.append(biolink_type)
-
-    # Return sorted list, or last category if none found
-    return sorted(most_specific) if most_specific else [categories[-1]]
+    return most_specific_types(toolkit, categories)
 
 
 def main():
@@ -0,0 +1,86 @@
+"""Find the most specific Biolink types in a list of categories
+
+Shared by the biolink and node-resolver servers so the type-hierarchy
+reduction lives in one place.
+"""
+import functools
+from typing import List
+from bmt import Toolkit
+
+
+@functools.lru_cache(maxsize=4096)
+def cached_ancestors(
+    toolkit: Toolkit,
+    name: str,
+    formatted: bool = True,
+    mixin: bool = True,
+    reflexive: bool = True
+) -> tuple[str, ...]:
+    """Memoized toolkit.get_ancestors - the Biolink Model is static once loaded"""
+    return tuple(toolkit.get_ancestors(name, reflexive=reflexive, formatted=formatted, mixin=mixin) or ())
+
+
+@functools.lru_cache(maxsize=8192)
+def ancestor_set(
+    toolkit: Toolkit,
+    name: str,
+    formatted: bool = True,
+    mixin: bool = True,
+    reflexive: bool = True
+) -> frozenset[str]:
+    """Memoized ancestors as a frozenset, for membership tests"""
+    return frozenset(cached_ancestors(toolkit, name, formatted=formatted, mixin=mixin, reflexive=reflexive))
+
+
+# Above this many categories, reduce with integer-encoded ancestor bitmasks
+BITMASK_THRESHOLD = 32
+
+
+@functools.lru_cache(maxsize=8)
+def _ancestor_bitmasks(toolkit: Toolkit) -> dict[str, tuple[int, int]]:
+    """Map each Biolink class to (its own bit, the OR of its proper ancestors' bits)"""
+    classes = toolkit.get_all_classes(formatted=True)
+    bit_of = {name: 1 << i for i, name in enumerate(classes)}
+    masks = {}
+    for name, bit in bit_of.items():
+        ancestor_mask = 0
+        for ancestor in ancestor_set(toolkit, name, formatted=True, mixin=True, reflexive=True):
+            if ancestor != name:
+                ancestor_mask |= bit_of.get(ancestor, 0)
+        masks[name] = (bit, ancestor_mask)
+    return masks
+
+
+def most_specific_types(toolkit: Toolkit, categories: List[str]) -> List[str]:
+    """Filter out any category that is an ancestor of another category in the list
+
+    Args:
+        toolkit: BMT toolkit used to look up ancestors
+        categories: List of Biolink categories (e.g., ['biolink:Disease', 'biolink:NamedThing'])
+
+    Returns:
+        List of most specific categories, sorted alphabetically
+    """
+    # Drop duplicates (keeping order); zero or one category needs no reduction
+    categories = list(dict.fromkeys(categories))
+    if len(categories) <= 1:
+        return categories or ['biolink:NamedThing']
+
+    if len(categories) > BITMASK_THRESHOLD:
+        masks = _ancestor_bitmasks(toolkit)
+        if all(t in masks for t in categories):
+            ancestors_of_others = 0
+            for t in categories:
+                ancestors_of_others |= masks[t][1]
+            most_specific = [t for t in categories if not masks[t][0] & ancestors_of_others]
+            return sorted(most_specific) or [categories[-1]]
+
+    # Look up each ancestor set once (reflexive=True includes the type itself)
+    anc = {t: ancestor_set(toolkit, t, formatted=True, mixin=True, reflexive=True) for t in categories}
+
+    # A type is not most specific if it is a proper ancestor of any type in the list
+    ancestors_of_others = set().union(*[anc[t] - {t} for t in categories])
+    most_specific = [t for t in categories if t not in ancestors_of_others]
+
+    # Return sorted list, or last category if none found
+    return sorted(most_specific) or [categories[-1]]
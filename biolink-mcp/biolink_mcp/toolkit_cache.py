@@ -0,0 +1,49 @@
+"""Load the BMT toolkit, reusing a pickled copy between server starts
+
+Shared by the biolink and node-resolver servers, which both parse the
+Biolink Model at import time.
+"""
+import hashlib
+import logging
+import os
+import pickle
+from importlib import metadata
+from pathlib import Path
+from bmt import Toolkit
+
+logger = logging.getLogger(__name__)
+
+
+def toolkit_cache_path(version: str | None) -> Path:
+    """Pickle file for a toolkit built from version under BIOLINK_CACHE_DIR (default: ~/.cache/biolink_mcp)
+
+    version is whatever Toolkit() was given - usually a schema URL or path - so
+    it is hashed to keep the file name flat.
+    """
+    cache_dir = Path(os.getenv("BIOLINK_CACHE_DIR", Path.home() / ".cache" / "biolink_mcp"))
+    schema_key = hashlib.sha256(version.encode()).hexdigest()[:16] if version else "default"
+    return cache_dir / f"toolkit-{metadata.version('bmt')}-{schema_key}.pkl"
+
+
+def load_toolkit(version: str | None) -> Toolkit:
+    """Load the BMT toolkit, reusing a pickled copy from an earlier start when possible
+
+    Parsing the Biolink Model takes several seconds, so the initialized toolkit
+    is cached at toolkit_cache_path(version), keyed on the bmt and Biolink Model versions.
+    """
+    cache_path = toolkit_cache_path(version)
+    if cache_path.exists():
+        try:
+            return pickle.loads(cache_path.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError) as e:
+            logger.warning("Ignoring unreadable Biolink toolkit cache %s (%r); rebuilding it", cache_path, e)
+
+    toolkit = Toolkit(version) if version else Toolkit()
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(pickle.dumps(toolkit))
+        tmp_path.replace(cache_path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+        logger.warning("Could not write Biolink toolkit cache %s (%r); the next start parses the model again", cache_path, e)
+    return toolkit
@@ -0,0 +1,61 @@
+"""Test the pickled BMT toolkit cache"""
+import logging
+import pickle
+from biolink_mcp.server import toolkit
+from biolink_mcp.toolkit_cache import load_toolkit, toolkit_cache_path
+
+SCHEMA_URL = "https://raw.githubusercontent.com/biolink/biolink-model/v4.2.2/biolink-model.yaml"
+
+
+def _write_marked_cache(version):
+    """Pickle the loaded toolkit, tagged so a load from the cache can be told apart from a re-parse"""
+    marked = pickle.loads(pickle.dumps(toolkit))
+    marked.cache_marker = "from-cache"
+    toolkit_cache_path(version).parent.mkdir(parents=True, exist_ok=True)
+    toolkit_cache_path(version).write_bytes(pickle.dumps(marked))
+
+
+def test_load_toolkit_from_cache(tmp_path, monkeypatch):
+    """Test load_toolkit reuses a pickled toolkit from BIOLINK_CACHE_DIR"""
+    monkeypatch.setenv("BIOLINK_CACHE_DIR", str(tmp_path))
+    _write_marked_cache(None)
+
+    cached = load_toolkit(None)
+    assert cached.cache_marker == "from-cache"
+    assert cached.get_ancestors("disease") == toolkit.get_ancestors("disease")
+
+
+def test_load_toolkit_from_cache_for_schema_url(tmp_path, monkeypatch):
+    """Test a version given as a URL maps to a flat cache file that is read back"""
+    monkeypatch.setenv("BIOLINK_CACHE_DIR", str(tmp_path))
+    assert toolkit_cache_path(SCHEMA_URL).parent == tmp_path
+    assert toolkit_cache_path(SCHEMA_URL) != toolkit_cache_path(None)
+    _write_marked_cache(SCHEMA_URL)
+
+    assert load_toolkit(SCHEMA_URL).cache_marker == "from-cache"
+
+
+def test_load_toolkit_writes_cache_for_schema_url(tmp_path, monkeypatch, caplog):
+    """Test building from a schema URL writes its cache file without warnings"""
+    monkeypatch.setenv("BIOLINK_CACHE_DIR", str(tmp_path))
+
+    with caplog.at_level(logging.WARNING, logger="biolink_mcp.toolkit_cache"):
+        built = load_toolkit(SCHEMA_URL)
+
+    assert caplog.text == ""
+    assert list(tmp_path.iterdir()) == [toolkit_cache_path(SCHEMA_URL)]
+    assert pickle.loads(toolkit_cache_path(SCHEMA_URL).read_bytes()).get_ancestors("disease") == built.get_ancestors("disease")
+
+
+def test_load_toolkit_rebuilds_corrupt_cache(tmp_path, monkeypatch, caplog):
+    """Test load_toolkit logs an unreadable cache file, then rebuilds and rewrites it"""
+    monkeypatch.setenv("BIOLINK_CACHE_DIR", str(tmp_path))
+    cache_path = toolkit_cache_path(None)
+    cache_path.write_bytes(b"not a pickle")
+
+    with caplog.at_level(logging.WARNING, logger="biolink_mcp.toolkit_cache"):
+        rebuilt = load_toolkit(None)
+
+    assert "unreadable Biolink toolkit cache" in caplog.text
+    assert "named thing" in rebuilt.get_ancestors("disease")
+    assert pickle.loads(cache_path.read_bytes()).get_ancestors("disease") == rebuilt.get_ancestors("disease")
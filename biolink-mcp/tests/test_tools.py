@@ -1,5 +1,6 @@
 """Test each exposed MCP tool function"""
 import pytest
+from biolink_mcp import specificity
 from biolink_mcp.server import (
     get_element,
     get_ancestors,
@@ -11,6 +12,7 @@ from biolink_mcp.server import (
     is_predicate,
     get_slot_domain,
     get_slot_range,
+    find_most_specific_types,
 )
 
 
@@ -96,3 +98,39 @@ def test_get_slot_range():
     assert isinstance(result, list)
     assert len(result) > 0
     assert "named thing" in result
+
+
+def test_find_most_specific_types():
+    """Test find_most_specific_types drops ancestors of other categories"""
+    result = find_most_specific_types.fn(["biolink:NamedThing", "biolink:Disease", "biolink:DiseaseOrPhenotypicFeature"])
+    assert result == ["biolink:Disease"]
+
+
+def test_find_most_specific_types_single_string():
+    """Test find_most_specific_types with a single category string"""
+    assert find_most_specific_types.fn("biolink:Gene") == ["biolink:Gene"]
+
+
+def test_find_most_specific_types_empty():
+    """Test find_most_specific_types with no categories"""
+    assert find_most_specific_types.fn([]) == ["biolink:NamedThing"]
+
+
+def test_find_most_specific_types_many_categories(monkeypatch):
+    """Test the bitmask reduction on large lists matches the set-based reduction"""
+    all_classes = get_all_classes.fn(formatted=True)
+    inputs = [all_classes, all_classes[::3], all_classes[1::5], all_classes[::-7]]
+    assert all(len(categories) > specificity.BITMASK_THRESHOLD for categories in inputs)
+
+    bitmask_results = [find_most_specific_types.fn(categories) for categories in inputs]
+    monkeypatch.setattr(specificity, "BITMASK_THRESHOLD", len(all_classes))
+    set_results = [find_most_specific_types.fn(categories) for categories in inputs]
+
+    assert bitmask_results == set_results
+    assert "biolink:NamedThing" not in bitmask_results[0]
+    assert "biolink:BiologicalEntity" not in bitmask_results[0]
+
+
+def test_find_most_specific_types_duplicates():
+    """Test find_most_specific_types collapses repeated categories"""
+    assert find_most_specific_types.fn(["biolink:Gene", "biolink:Gene"]) == ["biolink:Gene"]
@@ -26,17 +26,15 @@ async def find_most_specific_type_for_term(search_term: str, limit: int = 5):
     # Step 1: Use Name Resolver to find CURIEs
     print(f"\n📍 STEP 1: Searching for '{search_term}' in Name Resolver...")
 
-    # Get formatted output for display
-    lookup_display = await lookup.fn(query=search_term, limit=limit)
-    print(lookup_display)
-
-    # Get JSON output for processing
     lookup_results = await lookup.fn(query=search_term, limit=limit, return_json=True)
 
     if not lookup_results:
         print(f"❌ No results found for '{search_term}'")
         return
 
+    for result in lookup_results:
+        print(f"   {result.get('label', 'Unknown')} ({result.get('curie', 'Unknown')})")
+
     # Extract CURIEs
     curies = [result.get("curie") for result in lookup_results if result.get("curie")]
     print(f"\n✅ Found {len(curies)} CURIEs: {curies}")
@@ -44,27 +42,10 @@ async def find_most_specific_type_for_term(search_term: str, limit: int = 5):
     # Step 2: Use Node Normalizer to get types for each CURIE
     print(f"\n📍 STEP 2: Normalizing CURIEs to get Biolink types...")
 
-    # Get formatted output for display
-    norm_display = await get_normalized_nodes.fn(curies=curies, show_types=True)
-    print(norm_display)
-
-    # Get JSON output for processing
     norm_data = await get_normalized_nodes.fn(curies=curies, return_json=True)
 
-    # Collect all types from all CURIEs
-    all_types = []
-    for curie in curies:
-        if curie in norm_data and norm_data[curie]:
-            node_info = norm_data[curie]
-            if "type" in node_info:
-                types = node_info["type"]
-                if isinstance(types, list):
-                    all_types.extend(types)
-                else:
-                    all_types.append(types)
-
-    # Remove duplicates
-    unique_types = list(set(all_types))
+    # Collect all types from all returned CURIEs, removing duplicates
+    unique_types = list(dict.fromkeys(t for node in norm_data.values() if node for t in node.get("type") or ()))
 
     print(f"\n✅ Found {len(unique_types)} unique Biolink types: {unique_types}")
 
@@ -80,18 +61,18 @@ async def find_most_specific_type_for_term(search_term: str, limit: int = 5):
 async def main():
     """Run examples with different search terms"""
 
-    # Example 1: Search for a disease
-    await find_most_specific_type_for_term("diabetes", limit=1)
+    # Search for a disease, a gene, and a chemical concurrently
+    search_terms = ["diabetes", "BRCA1", "aspirin"]
+    results = await asyncio.gather(
+        *(find_most_specific_type_for_term(term, limit=1) for term in search_terms)
+    )
 
     print("\n" * 2)
-
-    # Example 2: Search for a gene
-    await find_most_specific_type_for_term("BRCA1", limit=1)
-
-    print("\n" * 2)
-
-    # Example 3: Search for a chemical
-    await find_most_specific_type_for_term("aspirin", limit=1)
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    for term, most_specific in zip(search_terms, results):
+        print(f"{term}: {most_specific}")
 
 
 if __name__ == "__main__":
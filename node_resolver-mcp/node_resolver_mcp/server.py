@@ -1,53 +1,136 @@
 #!/usr/bin/env python3
 
 import os
+import asyncio
+import functools
+import random
 import httpx
 from typing import List
 from fastmcp import FastMCP
-from bmt import Toolkit
+from biolink_mcp.specificity import cached_ancestors, most_specific_types
+from biolink_mcp.toolkit_cache import load_toolkit
+from cachetools import TTLCache
 import itertools
-from typing_extensions import TypedDict
+from dataclasses import asdict, dataclass
 
 # Create the FastMCP server
 mcp = FastMCP("node-resolver", version="0.1.0")
 
-# Create HTTP client for API calls
-httpx_client = httpx.AsyncClient()
+# Create HTTP client for API calls; HTTP/2 lets concurrent lookups share one
+# pooled connection per service
+httpx_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=httpx.Timeout(30.0, connect=5.0)
+)
 NAME_RESOLVER_URL = os.getenv("NAME_RESOLVER_URL", "https://name-resolution-sri.renci.org")
 NODE_NORMALIZER_URL = os.getenv("NODE_NORMALIZER_URL", "https://nodenormalization-sri.renci.org")
 
+# Cache service responses in-process so repeated lookups skip the network
+CACHE_TTL = float(os.getenv("NODE_RESOLVER_CACHE_TTL", "3600"))
+_curies_cache = TTLCache(maxsize=2048, ttl=CACHE_TTL)
+_types_cache = TTLCache(maxsize=16384, ttl=CACHE_TTL)
+# Lookup already being fetched for every cache key, so concurrent misses for
+# the same key (e.g. rows sharing an entity name) share one upstream call
+_curies_inflight: dict[tuple, asyncio.Task] = {}
+_types_inflight: dict[str, asyncio.Task] = {}
+
+# Maximum number of CURIEs sent in one Node Normalization request
+NORMALIZER_BATCH_SIZE = 500
+
+# Retry rate limiting and transient failures from the Translator services
+MAX_ATTEMPTS = 4
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+# Longest wait between attempts, whatever Retry-After asks for
+MAX_RETRY_WAIT = 5.0
+
+
+async def _request_with_retry(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request, retrying 429s, transient 5xx responses, and transport errors
+
+    Waits for the server's Retry-After when it gives one in seconds, otherwise
+    backs off exponentially with jitter; either wait is capped at MAX_RETRY_WAIT.
+    The final failure is raised.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        last_attempt = attempt == MAX_ATTEMPTS - 1
+        backoff = min(MAX_RETRY_WAIT, 0.2 * 2 ** attempt + random.uniform(0, 0.2))
+        try:
+            response = await httpx_client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+            await asyncio.sleep(backoff)
+            continue
+
+        if response.status_code in RETRY_STATUS_CODES and not last_attempt:
+            retry_after = response.headers.get("Retry-After", "")
+            await asyncio.sleep(min(float(retry_after), MAX_RETRY_WAIT) if retry_after.isdigit() else backoff)
+            continue
+
+        response.raise_for_status()
+        return response
+
+
 # Initialize BMT toolkit
 biolink_version = os.getenv("BIOLINK_VERSION")
-toolkit = Toolkit(biolink_version) if biolink_version else Toolkit()
+toolkit = load_toolkit(biolink_version)
+
+
+# Classify slots once; node properties with no domain apply to every class
+_ALL_SLOTS = toolkit.get_all_slots()
+_NODE_PROP = {s for s in _ALL_SLOTS if toolkit.is_node_property(s)}
+_SLOTS_WITHOUT_DOMAIN = [s for s in _ALL_SLOTS if s in _NODE_PROP and not toolkit.get_slot_domain(s)]
+
+
+@dataclass(frozen=True, slots=True)
+class NodeProp:
+    property: str
+    type: str
+    description: str | None
+
+
+@functools.lru_cache(maxsize=1024)
+def _slots_with_class_domain(class_name: str) -> tuple[str, ...]:
+    """Memoized toolkit.get_all_slots_with_class_domain"""
+    return tuple(toolkit.get_all_slots_with_class_domain(class_name))
+
 
-# class NodeProperty(TypedDict):
-#     property: str
-#     type: str
-#     description: str
 @mcp.tool()
-def get_node_properties_for_class(class_name: str):
-    ancestors = toolkit.get_ancestors(class_name)
+def get_node_properties_for_class(class_name: str) -> list[dict]:
+    """Get all node properties (slots) valid for a Biolink class
+
+    Args:
+        class_name: Name of the Biolink class (e.g., 'biolink:SmallMolecule')
 
-    all_slots = toolkit.get_all_slots()
-    slots_without_domain = [s for s in all_slots if len(toolkit.get_slot_domain(s)) == 0 and toolkit.is_node_property(s)]
+    Returns:
+        List of {property, type, description} dicts
+    """
+    return [asdict(prop) for prop in _node_properties(class_name)]
 
-    slots_nested = [toolkit.get_all_slots_with_class_domain(a) for a in ancestors]
-    slots_from_class = set(s for sl in slots_nested for s in sl)
 
-    slots_with_domain = [s for s in slots_from_class if toolkit.is_node_property(s)]
+@functools.lru_cache(maxsize=256)
+def _slots_for_class(class_name: str) -> frozenset[str]:
+    """Memoized slots whose domain is a Biolink class or one of its ancestors"""
+    ancestors = cached_ancestors(toolkit, class_name, formatted=False, mixin=True, reflexive=True)
+    return frozenset().union(*(_slots_with_class_domain(a) for a in ancestors))
+
+
+@functools.lru_cache(maxsize=256)
+def _node_properties(class_name: str) -> tuple[NodeProp, ...]:
+    """Memoized node properties valid for a Biolink class - the Biolink Model is static once loaded"""
+    slots_with_domain = [s for s in _slots_for_class(class_name) if s in _NODE_PROP]
 
     output = []
-    for s in itertools.chain(slots_with_domain, slots_without_domain):
+    for s in itertools.chain(slots_with_domain, _SLOTS_WITHOUT_DOMAIN):
         value_type = toolkit.get_value_type_for_slot(s)
         type = toolkit.view.get_type(value_type)
         primative_type = type.typeof or value_type
 
-        output.append({
-            "property": s,
-            "type": primative_type,
-            "description": type.description,
-        })
-    return output
+        output.append(NodeProp(s, primative_type, type.description))
+
+    return tuple(output)
+
 
 @mcp.tool()
 async def resolve_entity_to_curies(
@@ -67,6 +150,29 @@ async def resolve_entity_to_curies(
     Returns:
         List of CURIEs for the entity
     """
+    cache_key = (entity, limit, biolink_type, frozenset(only_prefixes or ()))
+    if cache_key in _curies_cache:
+        return list(_curies_cache[cache_key])
+
+    task = _curies_inflight.get(cache_key)
+    if task is None:
+        task = _curies_inflight[cache_key] = asyncio.create_task(
+            _lookup(cache_key, entity, limit, biolink_type, only_prefixes)
+        )
+        task.add_done_callback(lambda _: _curies_inflight.pop(cache_key, None))
+
+    # Shield so one cancelled caller doesn't cancel the lookup for everyone else
+    return list(await asyncio.shield(task))
+
+
+async def _lookup(
+    cache_key: tuple,
+    entity: str,
+    limit: int,
+    biolink_type: str | None,
+    only_prefixes: list[str] | None
+) -> List[str]:
+    """Look up an entity name with the Name Resolution Service and cache its CURIEs"""
     params = [
         ("string", entity),
         ("limit", str(limit)),
@@ -80,18 +186,16 @@ async def resolve_entity_to_curies(
     for prefix in (only_prefixes or []):
         params.append(("only_prefixes", prefix))
 
-    response = await httpx_client.get(
+    response = await _request_with_retry(
+        "GET",
         f"{NAME_RESOLVER_URL}/lookup",
         params=params
     )
-    response.raise_for_status()
     lookup_results = response.json()
 
-    if not lookup_results:
-        return []
-
     # Extract CURIEs
-    curies = [result.get("curie") for result in lookup_results if result.get("curie")]
+    curies = [result.get("curie") for result in lookup_results or [] if result.get("curie")]
+    _curies_cache[cache_key] = curies
     return curies
 
 
@@ -108,38 +212,69 @@ async def get_types_for_curies(curies: List[str]) -> List[str]:
     if not curies:
         return []
 
-    norm_params = []
-    for curie in curies:
-        norm_params.append(("curie", curie))
-    norm_params.extend([
-        ("conflate", "true"),
-        ("drug_chemical_conflate", "true"),
-        ("description", "false"),
-        ("individual_types", "false")
-    ])
-
-    response = await httpx_client.get(
+    # Only ask the Node Normalization Service about CURIEs we haven't seen
+    # and that aren't already being fetched
+    types_by_curie = {}
+    waiting = {}
+    uncached = []
+    for curie in dict.fromkeys(curies):
+        types = _types_cache.get(curie)
+        if types is not None:
+            types_by_curie[curie] = types
+        elif curie in _types_inflight:
+            waiting[curie] = _types_inflight[curie]
+        else:
+            uncached.append(curie)
+    if uncached:
+        task = asyncio.create_task(_fetch_types_for_curies(uncached))
+        for curie in uncached:
+            waiting[curie] = _types_inflight[curie] = task
+
+        def forget_inflight(_):
+            for curie in uncached:
+                _types_inflight.pop(curie, None)
+
+        task.add_done_callback(forget_inflight)
+
+    for curie, task in waiting.items():
+        # Shield so one cancelled caller doesn't cancel the fetch for everyone else
+        types_by_curie[curie] = (await asyncio.shield(task))[curie]
+
+    # Collect all Biolink types, removing duplicates
+    return list(dict.fromkeys(t for curie in curies for t in types_by_curie[curie]))
+
+
+async def _fetch_types_for_curies(curies: List[str]) -> dict[str, List[str]]:
+    """Fetch the Biolink types of each CURIE from the Node Normalization Service and cache them"""
+    batches = []
+    curie_iter = iter(curies)
+    while batch := list(itertools.islice(curie_iter, NORMALIZER_BATCH_SIZE)):
+        batches.append(batch)
+
+    norm_data = {}
+    for batch_data in await asyncio.gather(*(_normalize_batch(batch) for batch in batches)):
+        norm_data.update(batch_data)
+
+    # Node Normalization always returns "type" as a list; unknown CURIEs map to null
+    types_by_curie = {curie: (norm_data.get(curie) or {}).get("type") or [] for curie in curies}
+    _types_cache.update(types_by_curie)
+    return types_by_curie
+
+
+async def _normalize_batch(curies: List[str]) -> dict:
+    """POST one batch of CURIEs to the Node Normalization Service"""
+    response = await _request_with_retry(
+        "POST",
         f"{NODE_NORMALIZER_URL}/get_normalized_nodes",
-        params=norm_params
+        json={
+            "curies": curies,
+            "conflate": True,
+            "drug_chemical_conflate": True,
+            "description": False,
+            "individual_types": False
+        }
     )
-    response.raise_for_status()
-    norm_data = response.json()
-
-    # Collect all Biolink types
-    all_types = []
-    for curie in curies:
-        if curie in norm_data and norm_data[curie]:
-            node_info = norm_data[curie]
-            if "type" in node_info:
-                types = node_info["type"]
-                if isinstance(types, list):
-                    all_types.extend(types)
-                else:
-                    all_types.append(types)
-
-    # Remove duplicates
-    unique_types = list(set(all_types))
-    return unique_types
+    return response.json()
 
 
 @mcp.tool()
@@ -155,25 +290,7 @@ def find_most_specific_types(types: List[str]) -> List[str]:
     Returns:
         List of most specific Biolink types, sorted alphabetically
     """
-    if not types:
-        return ['biolink:NamedThing']
-
-    most_specific = []
-    for biolink_type in types:
-        is_most_specific = True
-        for other in types:
-            if other != biolink_type:
-                # Get ancestors with reflexive=True (includes the type itself)
-                ancestors = toolkit.get_ancestors(other, reflexive=True, formatted=True, mixin=True)
-                if ancestors and biolink_type in ancestors:
-                    # biolink_type is an ancestor of other, so it's not most specific
-                    is_most_specific = False
-                    break
-        if is_most_specific:
-            most_specific.append(biolink_type)
-
-    # Return sorted list, or last type if none found
-    return sorted(most_specific) if most_specific else [types[-1]]
+    return most_specific_types(toolkit, types)
 
 
 @mcp.tool()
@@ -311,11 +428,13 @@ async def enrich_node_from_row(
     best_type = most_specific[0] if most_specific else "biolink:NamedThing"
 
     # Step 4: Get properties for this type
-    properties = get_node_properties_for_class.fn(best_type)
+    properties = _node_properties(best_type)
 
     # Step 5: Map CSV columns to properties
     mapped_data = {}
-    property_names = [prop["property"] for prop in properties]
+    mapped_csv_cols: set[str] = set()
+    prop_type = {prop.property: prop.type for prop in properties}
+    property_names = set(prop_type)
 
     # Try to map CSV columns to property names
     for csv_column, value in row_data.items():
@@ -331,8 +450,9 @@ async def enrich_node_from_row(
             mapped_data[normalized_column] = {
                 "csv_column": csv_column,
                 "value": value,
-                "property_type": next((p["type"] for p in properties if p["property"] == normalized_column), "unknown")
+                "property_type": prop_type.get(normalized_column, "unknown")
             }
+            mapped_csv_cols.add(csv_column)
         # Partial/fuzzy matching for common patterns
         else:
             # Description column
@@ -340,17 +460,20 @@ async def enrich_node_from_row(
                 mapped_data["description"] = {
                     "csv_column": csv_column,
                     "value": value,
-                    "property_type": next((p["type"] for p in properties if p["property"] == "description"), "unknown")
+                    "property_type": prop_type.get("description", "unknown")
                 }
-            # ID columns might map to has_identifier or xref
+                mapped_csv_cols.add(csv_column)
+            # ID columns might map to has_identifier or xref; xref isn't a node
+            # property, so check it against every slot the type's domain allows
             elif "id" in normalized_column or "identifier" in normalized_column:
-                if "xref" in property_names:
+                if "xref" in _slots_for_class(best_type):
                     mapped_data.setdefault("xref", [])
                     mapped_data["xref"].append({
                         "csv_column": csv_column,
                         "value": value,
                         "property_type": "string"
                     })
+                    mapped_csv_cols.add(csv_column)
 
     return {
         "entity": entity,
@@ -358,14 +481,67 @@ async def enrich_node_from_row(
         "type": best_type,
         "all_curies": curies,
         "all_types": types,
-        "valid_properties": properties,
+        "valid_properties": [asdict(prop) for prop in properties],
         "mapped_data": mapped_data,
-        "unmapped_columns": [col for col in row_data.keys() if col != name_column and col not in [m.get("csv_column") for m in (mapped_data.values() if isinstance(mapped_data, dict) else [])]]
+        "unmapped_columns": [col for col in row_data if col != name_column and col not in mapped_csv_cols]
     }
 
 
+@mcp.tool()
+async def enrich_rows(
+    rows: list[dict],
+    name_column: str = "name",
+    limit: int = 1,
+    biolink_type: str | None = None,
+    only_prefixes: list[str] | None = None,
+    concurrency: int = 16
+) -> list[dict]:
+    """Enrich many CSV rows at once, running enrich_node_from_row on each concurrently
+
+    Args:
+        rows: List of dictionaries representing CSV rows (column_name: value)
+        name_column: Name of the column containing the entity name (default: "name")
+        limit: Number of CURIE candidates to consider per row (default: 1)
+        biolink_type: Filter by Biolink entity type during name resolution
+        only_prefixes: Only include results from these namespaces
+        concurrency: Maximum number of rows being enriched at the same time (default: 16)
+
+    Returns:
+        List of enrich_node_from_row results, in the same order as rows. A row whose
+        lookups fail gets {"error", "row_data"} instead, without failing the other rows.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def enrich(row: dict) -> dict:
+        async with semaphore:
+            try:
+                return await enrich_node_from_row.fn(row, name_column, limit, biolink_type, only_prefixes)
+            except httpx.HTTPError as e:
+                return {
+                    "error": f"Lookup failed: {e!r}",
+                    "row_data": row
+                }
+
+    return await asyncio.gather(*(enrich(row) for row in rows))
+
+
+async def _serve():
+    """Run the server, closing pooled HTTP connections once it exits
+
+    The client is shared by every MCP session, so it is closed here rather than
+    in a FastMCP lifespan, which runs once per session.
+    """
+    try:
+        await mcp.run_async()
+    finally:
+        await httpx_client.aclose()
+
+
 def main():
-    mcp.run()
+    asyncio.run(_serve())
 
 
 if __name__ == "__main__":
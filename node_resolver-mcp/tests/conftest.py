@@ -0,0 +1,81 @@
+"""Shared fixtures: tests call the Translator services through the server's own HTTP client"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from node_resolver_mcp import server
+
+
+@pytest.fixture(scope="session")
+def run():
+    """Run a coroutine to completion on one event loop shared by the whole session
+
+    The module-level httpx_client keeps its pooled connections on the loop that
+    opened them, as it does under the server, so every test uses the same loop.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(server.httpx_client.aclose())
+    loop.close()
+
+
+@pytest.fixture
+def sent_requests():
+    """Start from empty caches and record (method, path) of every request httpx_client sends"""
+    sent = []
+
+    async def record(request):
+        sent.append((request.method, request.url.path))
+
+    server._curies_cache.clear()
+    server._types_cache.clear()
+    server.httpx_client.event_hooks["request"].append(record)
+    yield sent
+    server.httpx_client.event_hooks["request"].remove(record)
+    server._curies_cache.clear()
+    server._types_cache.clear()
+
+
+class _QueuedReplyHandler(BaseHTTPRequestHandler):
+    """Answer with the next queued (status, headers) reply, then with 200 and the configured body"""
+
+    def _reply(self):
+        state = self.server.state
+        if self.command == "POST":
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if state["replies"]:
+            status, headers = state["replies"].pop(0)
+            body = b""
+        else:
+            status, headers = 200, {"Content-Type": "application/json"}
+            body = json.dumps(state["body"]).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_service():
+    """A local HTTP server with queued failure replies
+
+    The live services can't be made to rate-limit or fail on demand, so retries
+    and failures are tested against this server through the same client.
+    Returns a dict with its "url", the "replies" queue of (status, headers), and
+    the JSON "body" sent once the queue is empty.
+    """
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _QueuedReplyHandler)
+    httpd.state = {"url": f"http://127.0.0.1:{httpd.server_port}", "replies": [], "body": None}
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.state
+    httpd.shutdown()
+    httpd.server_close()
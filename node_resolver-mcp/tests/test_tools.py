@@ -0,0 +1,99 @@
+"""Test the node resolver tools against the Translator services"""
+import time
+import httpx
+import pytest
+from fastmcp import Client
+from node_resolver_mcp import server
+from node_resolver_mcp.server import mcp, enrich_node_from_row, enrich_rows, get_types_for_curies
+
+
+def test_sequential_sessions_share_http_client(run, sent_requests):
+    """Test a second MCP session can still call upstream after the first one ends"""
+    async def call_in_new_session(curie):
+        async with Client(mcp) as client:
+            result = await client.call_tool("get_types_for_curies", {"curies": [curie]})
+            return result.data
+
+    # Different CURIEs so neither call is answered from the types cache
+    assert "biolink:Disease" in run(call_in_new_session("MONDO:0005148"))
+    assert "biolink:Disease" in run(call_in_new_session("MONDO:0005015"))
+    assert len(sent_requests) == 2
+
+
+def test_get_types_for_curies_cache(run, sent_requests):
+    """Test types for a CURIE seen before are answered without an upstream request"""
+    first = run(get_types_for_curies.fn(["MONDO:0005148"]))
+    assert run(get_types_for_curies.fn(["MONDO:0005148"])) == first
+    assert len(sent_requests) == 1
+
+
+def test_enrich_node_from_row_id_column_to_xref(run, sent_requests):
+    """Test an ID column is mapped to xref and not reported as unmapped"""
+    result = run(enrich_node_from_row.fn({"name": "aspirin", "CAS ID": "50-78-2"}))
+    assert result["mapped_data"]["xref"] == [{"csv_column": "CAS ID", "value": "50-78-2", "property_type": "string"}]
+    assert "CAS ID" not in result["unmapped_columns"]
+
+
+def test_enrich_rows(run, sent_requests):
+    """Test enrich_rows enriches each row, keeping the input order"""
+    rows = [{"name": "diabetes"}, {"name": "aspirin", "Synonym": "ASA"}]
+    result = run(enrich_rows.fn(rows, concurrency=2))
+    assert [r["entity"] for r in result] == ["diabetes", "aspirin"]
+    assert result[0]["type"] == "biolink:Disease"
+    assert result[1]["curie"].startswith("CHEBI:")
+
+
+def test_enrich_rows_shares_lookups_for_repeated_names(run, sent_requests):
+    """Test concurrent rows with the same entity name share one lookup of each service"""
+    rows = [{"name": "aspirin", "Synonym": f"ASA {i}"} for i in range(5)]
+    result = run(enrich_rows.fn(rows, concurrency=5))
+    assert len({r["curie"] for r in result}) == 1
+    assert sorted(sent_requests) == [("GET", "/lookup"), ("POST", "/get_normalized_nodes")]
+
+
+def test_enrich_rows_failed_row(run, sent_requests, local_service, monkeypatch):
+    """Test one row's failed lookup is reported in place without losing the other rows"""
+    monkeypatch.setattr(server, "NAME_RESOLVER_URL", local_service["url"])
+    local_service["replies"].append((404, {}))
+    local_service["body"] = [{"curie": "MONDO:0005015"}]
+
+    rows = [{"name": "first"}, {"name": "second"}]
+    result = run(enrich_rows.fn(rows, concurrency=1))
+    assert "404" in result[0]["error"]
+    assert result[0]["row_data"] == {"name": "first"}
+    assert result[1]["curie"] == "MONDO:0005015"
+    assert result[1]["type"] == "biolink:Disease"
+
+
+def test_enrich_rows_invalid_concurrency(run):
+    """Test enrich_rows rejects a concurrency below 1 instead of blocking forever"""
+    with pytest.raises(ValueError):
+        run(enrich_rows.fn([{"name": "diabetes"}], concurrency=0))
+
+
+def test_retry_after_rate_limit(run, sent_requests, local_service):
+    """Test a 429 is retried after Retry-After and the later success returned"""
+    local_service["replies"].append((429, {"Retry-After": "0"}))
+    local_service["body"] = [{"curie": "MONDO:0005015"}]
+    response = run(server._request_with_retry("GET", f"{local_service['url']}/lookup"))
+    assert response.json() == [{"curie": "MONDO:0005015"}]
+    assert len(sent_requests) == 2
+
+
+def test_retry_after_is_capped(run, sent_requests, local_service, monkeypatch):
+    """Test a long Retry-After waits no more than MAX_RETRY_WAIT"""
+    monkeypatch.setattr(server, "MAX_RETRY_WAIT", 0.01)
+    local_service["replies"].append((429, {"Retry-After": "3600"}))
+    local_service["body"] = []
+    start = time.monotonic()
+    run(server._request_with_retry("GET", f"{local_service['url']}/lookup"))
+    assert time.monotonic() - start < 1
+
+
+def test_retry_gives_up_after_last_attempt(run, sent_requests, local_service, monkeypatch):
+    """Test the final 503 is raised once every attempt has failed"""
+    monkeypatch.setattr(server, "MAX_RETRY_WAIT", 0.01)
+    local_service["replies"].extend([(503, {})] * server.MAX_ATTEMPTS)
+    with pytest.raises(httpx.HTTPStatusError):
+        run(server._request_with_retry("GET", f"{local_service['url']}/lookup"))
+    assert len(sent_requests) == server.MAX_ATTEMPTS
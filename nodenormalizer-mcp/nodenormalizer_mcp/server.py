@@ -1,121 +1,323 @@
 #!/usr/bin/env python3
 
 import os
+import sys
+import asyncio
+import io
+import itertools
 import httpx
+import orjson
+from cachetools import TTLCache
 from fastmcp import FastMCP
 
+# Optional aiohttp-backed transport (pip install "nodenormalizer-mcp[aiohttp]")
+try:
+    import aiohttp
+    from httpx_aiohttp import AiohttpTransport
+except ImportError:
+    AiohttpTransport = None
+
+
 # Create the FastMCP server
 mcp = FastMCP("nodenormalizer", version="0.1.0")
 
-# Create HTTP client for API calls
-httpx_client = httpx.AsyncClient()
+# Create HTTP client for API calls. aiohttp's connection handling holds up
+# better under many concurrent calls when installed; otherwise HTTP/2
+# multiplexes back-to-back normalization requests over one pooled connection
 BASE_URL = os.getenv("NODE_NORMALIZER_URL", "https://nodenormalization-sri.renci.org")
+if AiohttpTransport is not None:
+    transport = AiohttpTransport(client=lambda: aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=200, limit_per_host=100, ttl_dns_cache=300, keepalive_timeout=60)
+    ))
+else:
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+    )
+httpx_client = httpx.AsyncClient(
+    transport=transport,
+    base_url=BASE_URL,
+    timeout=httpx.Timeout(30.0, connect=5.0),
+    headers={"accept-encoding": "gzip, br"}
+)
 
+# Maximum number of CURIEs sent in one Node Normalization request
+BATCH_SIZE = 250
 
-@mcp.tool()
-async def get_normalized_nodes(
-    curies: list[str],
-    conflate: bool = True,
-    drug_chemical_conflate: bool = True,
-    description: bool = False,
-    show_types: bool = True,
-    show_information_content: bool = True,
-    return_json: bool = False
-) -> str | dict:
-    """Normalize biological entity CURIEs and apply conflation
+# Batches up to this size go as a GET; larger ones as a POST with a JSON body
+GET_MAX_CURIES = 20
 
-    Args:
-        curies: List of CURIEs to normalize (e.g., ['MESH:D014867', 'NCIT:C34373'])
-        conflate: Whether to apply gene/protein conflation (default: true)
-        drug_chemical_conflate: Whether to apply drug/chemical conflation (default: true)
-        description: Whether to return CURIE descriptions when possible (default: false)
-        show_types: Whether to show biolink types (default: true)
-        show_information_content: Whether to show information content (default: true)
-        return_json: Return raw JSON instead of formatted string (default: false)
-    """
-    if not curies:
-        raise ValueError("No CURIEs provided")
+_CURIE = sys.intern("curie")
+_TRUE = "true"
+_FALSE = "false"
 
-    # Build parameters for GET request
-    params = []
-    for curie in curies:
-        params.append(("curie", curie))
-
-    params.extend([
-        ("conflate", "true" if conflate else "false"),
-        ("drug_chemical_conflate", "true" if drug_chemical_conflate else "false"),
-        ("description", "true" if description else "false"),
-        ("individual_types", "false")
-    ])
-
-    response = await httpx_client.get(
-        f"{BASE_URL}/get_normalized_nodes",
-        params=params
+# Query options for every (conflate, drug_chemical_conflate, description)
+# combination, built once
+_PARAMS_TAIL: dict[tuple[bool, bool, bool], tuple[tuple[str, str], ...]] = {
+    (conflate, drug_chemical_conflate, description): (
+        ("conflate", _TRUE if conflate else _FALSE),
+        ("drug_chemical_conflate", _TRUE if drug_chemical_conflate else _FALSE),
+        ("description", _TRUE if description else _FALSE),
+        ("individual_types", _FALSE)
     )
+    for conflate, drug_chemical_conflate, description in itertools.product((True, False), repeat=3)
+}
+
+
+async def _fetch_normalized_nodes(
+    curies: list[str],
+    conflate: bool,
+    drug_chemical_conflate: bool,
+    description: bool
+) -> dict:
+    """Fetch one batch of CURIEs from the Node Normalization Service"""
+    if len(curies) > GET_MAX_CURIES:
+        response = await httpx_client.post(
+            "/get_normalized_nodes",
+            content=orjson.dumps({
+                "curies": curies,
+                "conflate": conflate,
+                "drug_chemical_conflate": drug_chemical_conflate,
+                "description": description,
+                "individual_types": False
+            }),
+            headers={"content-type": "application/json"}
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    # Build parameters for GET request
+    params = list(zip(itertools.repeat(_CURIE), curies))
+    params += _PARAMS_TAIL[(conflate, drug_chemical_conflate, description)]
+
+    response = await httpx_client.get("/get_normalized_nodes", params=params)
     response.raise_for_status()
-    results = response.json()
+    return orjson.loads(response.content)
 
-    # Return raw JSON if requested
-    if return_json:
-        return results
 
+async def _fetch_all(curies: list[str], conflate: bool, drug_chemical_conflate: bool, description: bool) -> dict:
+    """Fetch CURIEs from the Node Normalization Service, splitting large inputs into batches"""
+    # Large inputs are split into concurrent requests so each response stays
+    # small and decoding one overlaps the network reads of the others
+    batches = [curies[i:i + BATCH_SIZE] for i in range(0, len(curies), BATCH_SIZE)]
+    results = {}
+    for batch_results in await asyncio.gather(
+        *(_fetch_normalized_nodes(batch, conflate, drug_chemical_conflate, description) for batch in batches)
+    ):
+        results.update(batch_results)
+    return results
+
+
+# Requests arriving within this many seconds of each other share upstream calls
+COALESCE_WINDOW = 0.005
+
+# Normalized nodes per (curie, conflate, drug_chemical_conflate, description);
+# NodeNorm results are effectively static within a session
+CACHE_TTL = float(os.getenv("NODE_NORMALIZER_CACHE_TTL", "3600"))
+_cache = TTLCache(maxsize=100_000, ttl=CACHE_TTL)
+
+# Sentinel for a key absent from a mapping (None means "not found" upstream)
+_MISSING = object()
+
+# Shared stand-in for an absent "id" object; never mutated
+_EMPTY: dict = {}
+
+# CURIEs waiting for the next upstream call, per (conflate, drug_chemical_conflate,
+# description) flag tuple, with the future that will hold the merged results
+_pending: dict[tuple[bool, bool, bool], tuple[dict[str, None], asyncio.Future]] = {}
+# Future for every cache key already queued or being fetched, so concurrent
+# misses for the same CURIE share one upstream call
+_inflight: dict[tuple, asyncio.Future] = {}
+_flush_tasks: set[asyncio.Task] = set()
+
+
+async def _coalesced_fetch(curies: list[str], flags: tuple[bool, bool, bool]) -> dict:
+    """Return normalized nodes for curies from the cache or a shared upstream call"""
+    found = {}
+    waiting = {}
+    for curie in dict.fromkeys(curies):
+        key = (curie, *flags)
+        node = _cache.get(key, _MISSING)
+        if node is not _MISSING:
+            found[curie] = node
+        elif key in _inflight:
+            waiting[curie] = _inflight[key]
+        else:
+            waiting[curie] = _inflight[key] = _enqueue(curie, flags)
+
+    for curie, future in waiting.items():
+        # Shield so one cancelled caller doesn't cancel the call for everyone else
+        fetched = await asyncio.shield(future)
+        if curie in fetched:
+            found[curie] = fetched[curie]
+
+    return {curie: found[curie] for curie in dict.fromkeys(curies) if curie in found}
+
+
+def _enqueue(curie: str, flags: tuple[bool, bool, bool]) -> asyncio.Future:
+    """Add curie to the next coalesced upstream call for flags and return its future"""
+    pending = _pending.get(flags)
+    if pending is None:
+        loop = asyncio.get_running_loop()
+        pending = _pending[flags] = ({}, loop.create_future())
+        loop.call_later(COALESCE_WINDOW, _flush, flags)
+
+    queued, future = pending
+    queued[curie] = None
+    return future
+
+
+def _flush(flags: tuple[bool, bool, bool]) -> None:
+    """Send every CURIE queued under flags in one upstream call"""
+    queued, future = _pending.pop(flags)
+    task = asyncio.get_running_loop().create_task(_resolve(list(queued), flags, future))
+    _flush_tasks.add(task)
+    task.add_done_callback(_flush_tasks.discard)
+
+
+async def _resolve(curies: list[str], flags: tuple[bool, bool, bool], future: asyncio.Future) -> None:
+    """Fetch curies and hand the results (or the failure) to everyone waiting on future"""
+    try:
+        results = await _fetch_all(curies, *flags)
+    except Exception as exc:
+        future.set_exception(exc)
+    else:
+        for curie in curies:
+            if curie in results:
+                _cache[(curie, *flags)] = results[curie]
+        future.set_result(results)
+    finally:
+        for curie in curies:
+            _inflight.pop((curie, *flags), None)
+
+
+def _as_list(value) -> list | tuple:
+    """Normalize a field that may be a list, a single value, or missing"""
+    return value if isinstance(value, list) else (value,) if value else ()
+
+
+def _render_text(
+    curies: list[str],
+    results: dict,
+    show_types: bool,
+    show_information_content: bool,
+    description: bool,
+    show_equivalent_ids: bool
+) -> str:
+    """Format normalization results as markdown text, one section per CURIE"""
     # Build response text
-    text = f"Normalized {len(curies)} CURIE(s):\n\n"
+    buf = io.StringIO()
+    buf.write(f"Normalized {len(curies)} CURIE(s):\n\n")
 
     for curie in curies:
-        if curie in results:
-            node_data = results[curie]
+        node_data = results.get(curie, _MISSING)
+        if node_data is not _MISSING:
             if node_data is None:
-                text += f"**{curie}:** Not found\n\n"
+                buf.write(f"**{curie}:** Not found\n\n")
                 continue
 
             # Get the normalized identifier
-            normalized_id = node_data.get("id", {}).get("identifier", "Unknown")
-            label = node_data.get("id", {}).get("label", "")
+            id_obj = node_data.get("id") or _EMPTY
+            normalized_id = id_obj.get("identifier", "Unknown")
+            label = id_obj.get("label", "")
 
-            text += f"**{curie}** → **{normalized_id}**"
+            buf.write(f"**{curie}** → **{normalized_id}**")
             if label:
-                text += f" ({label})"
-            text += "\n"
+                buf.write(f" ({label})")
+            buf.write("\n")
 
             # Show biolink type if requested
             if show_types:
-                type_info = node_data.get("type", [])
+                type_info = _as_list(node_data.get("type"))
                 if type_info:
-                    if isinstance(type_info, list):
-                        type_str = ", ".join(type_info)
-                    else:
-                        type_str = type_info
-                    text += f"   Type: {type_str}\n"
+                    buf.write(f"   Type: {', '.join(type_info)}\n")
 
             # Show information content if requested and available
             if show_information_content:
                 info_content = node_data.get("information_content")
                 if info_content is not None:
-                    text += f"   Information Content: {info_content}\n"
+                    buf.write(f"   Information Content: {info_content}\n")
 
             # Show description if requested and available
-            if description and "description" in node_data.get("id", {}):
-                desc = node_data["id"]["description"]
+            if description:
+                desc = id_obj.get("description")
                 if desc:
-                    text += f"   Description: {desc}\n"
+                    buf.write(f"   Description: {desc}\n")
 
-            # Show ALL equivalent identifiers
-            equivalent_ids = node_data.get("equivalent_identifiers", [])
-            if equivalent_ids and len(equivalent_ids) > 1:
-                other_ids = [eq["identifier"] for eq in equivalent_ids if eq["identifier"] != normalized_id]
-                if other_ids:
-                    text += f"   Equivalent IDs ({len(other_ids)}): {', '.join(other_ids)}\n"
+            # Show ALL equivalent identifiers if requested
+            if show_equivalent_ids:
+                equivalent_ids = node_data.get("equivalent_identifiers", [])
+                if equivalent_ids and len(equivalent_ids) > 1:
+                    other_ids = [eq["identifier"] for eq in equivalent_ids if eq["identifier"] != normalized_id]
+                    if other_ids:
+                        buf.write(f"   Equivalent IDs ({len(other_ids)}): {', '.join(other_ids)}\n")
 
-            text += "\n"
+            buf.write("\n")
         else:
-            text += f"**{curie}:** Not found in response\n\n"
+            buf.write(f"**{curie}:** Not found in response\n\n")
+
+    return buf.getvalue()
+
+
+@mcp.tool()
+async def get_normalized_nodes(
+    curies: list[str],
+    conflate: bool = True,
+    drug_chemical_conflate: bool = True,
+    description: bool = False,
+    show_types: bool = True,
+    show_information_content: bool = True,
+    show_equivalent_ids: bool = True,
+    return_json: bool = False
+) -> str | dict:
+    """Normalize biological entity CURIEs and apply conflation
+
+    Args:
+        curies: List of CURIEs to normalize (e.g., ['MESH:D014867', 'NCIT:C34373'])
+        conflate: Whether to apply gene/protein conflation (default: true)
+        drug_chemical_conflate: Whether to apply drug/chemical conflation (default: true)
+        description: Whether to return CURIE descriptions when possible (default: false)
+        show_types: Whether to show biolink types (default: true)
+        show_information_content: Whether to show information content (default: true)
+        show_equivalent_ids: Whether to list equivalent identifiers (default: true)
+        return_json: Return the raw JSON keyed by CURIE, skipping text formatting (default: false)
+    """
+    if not curies:
+        raise ValueError("No CURIEs provided")
 
-    return text
+    # Request and report each CURIE once, keeping the caller's order
+    curies = list(dict.fromkeys(curies))
+
+    results = await _coalesced_fetch(curies, (conflate, drug_chemical_conflate, description))
+
+    # Return raw JSON if requested; copied, since the node dicts are shared with the cache.
+    # An orjson round trip is several times faster than copy.deepcopy here
+    if return_json:
+        return orjson.loads(orjson.dumps(results))
+
+    return _render_text(curies, results, show_types, show_information_content, description, show_equivalent_ids)
+
+
+async def _serve():
+    """Run the server, closing pooled HTTP connections once it exits
+
+    The client is shared by every MCP session, so it is closed here rather than
+    in a FastMCP lifespan, which runs once per session.
+    """
+    try:
+        await mcp.run_async()
+    finally:
+        await httpx_client.aclose()
 
 
 def main():
-    mcp.run()
+    # Use the faster uvloop event loop when installed (pip install "nodenormalizer-mcp[uvloop]")
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(_serve())
+    else:
+        uvloop.run(_serve())
 
 
 if __name__ == "__main__":
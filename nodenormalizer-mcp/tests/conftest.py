@@ -0,0 +1,68 @@
+"""Shared fixtures: tests call the Node Normalization Service through the server's own HTTP client"""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import orjson
+import pytest
+from nodenormalizer_mcp import server
+
+
+@pytest.fixture(scope="session")
+def run():
+    """Run a coroutine to completion on one event loop shared by the whole session
+
+    The module-level httpx_client keeps its pooled connections on the loop that
+    opened them, as it does under the server, so every test uses the same loop.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(server.httpx_client.aclose())
+    loop.close()
+
+
+@pytest.fixture
+def sent_requests():
+    """Start from an empty cache and record the CURIEs of every request httpx_client sends"""
+    sent = []
+
+    async def record(request):
+        if request.method == "POST":
+            sent.append(orjson.loads(request.content)["curies"])
+        else:
+            sent.append(request.url.params.get_list("curie"))
+
+    server._cache.clear()
+    server.httpx_client.event_hooks["request"].append(record)
+    yield sent
+    server.httpx_client.event_hooks["request"].remove(record)
+    server._cache.clear()
+
+
+class _UnavailableHandler(BaseHTTPRequestHandler):
+    """Answer every request with 503 Service Unavailable"""
+
+    def _unavailable(self):
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_POST = _unavailable
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def unavailable_service(monkeypatch):
+    """Point httpx_client at a local HTTP server that is always unavailable
+
+    The live service can't be made to fail on demand, so failure handling is
+    tested against this server through the same client.
+    """
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _UnavailableHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(server.httpx_client, "base_url", f"http://127.0.0.1:{httpd.server_port}")
+    yield
+    httpd.shutdown()
+    httpd.server_close()
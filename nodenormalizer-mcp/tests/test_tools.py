@@ -0,0 +1,139 @@
+"""Test get_normalized_nodes against the Node Normalization Service"""
+import asyncio
+import httpx
+import pytest
+from fastmcp import Client
+from nodenormalizer_mcp.server import mcp, get_normalized_nodes
+
+# Identifiers NodeNorm doesn't know; it answers them with null
+UNKNOWN = "MONDO:9999999"
+
+
+def test_get_normalized_nodes_text(run, sent_requests):
+    """Test the markdown output for found and unknown CURIEs"""
+    text = run(get_normalized_nodes.fn(["MONDO:0005148", UNKNOWN]))
+    assert "**MONDO:0005148** → **MONDO:0005148** (type 2 diabetes mellitus)" in text
+    assert "biolink:Disease" in text
+    assert f"**{UNKNOWN}:** Not found" in text
+
+
+def test_get_normalized_nodes_lists_every_equivalent_id(run, sent_requests):
+    """Test the text output lists all equivalent identifiers, not a prefix of them"""
+    node = run(get_normalized_nodes.fn(["MONDO:0005148"], return_json=True))["MONDO:0005148"]
+    other_ids = [eq["identifier"] for eq in node["equivalent_identifiers"] if eq["identifier"] != "MONDO:0005148"]
+    assert len(other_ids) > 5
+
+    text = run(get_normalized_nodes.fn(["MONDO:0005148"]))
+    assert f"Equivalent IDs ({len(other_ids)}): {', '.join(other_ids)}\n" in text
+
+
+def test_get_normalized_nodes_json(run, sent_requests):
+    """Test return_json gives the raw nodes keyed by CURIE, once per CURIE"""
+    result = run(get_normalized_nodes.fn(["MONDO:0005148", "MONDO:0005148", UNKNOWN], return_json=True))
+    assert list(result) == ["MONDO:0005148", UNKNOWN]
+    assert result["MONDO:0005148"]["id"]["identifier"] == "MONDO:0005148"
+    assert result[UNKNOWN] is None
+
+
+def test_get_normalized_nodes_empty(run):
+    """Test an empty CURIE list is rejected"""
+    with pytest.raises(ValueError):
+        run(get_normalized_nodes.fn([]))
+
+
+def test_large_input_is_posted_in_batches(run, sent_requests):
+    """Test many CURIEs go out as batched POST requests"""
+    curies = [f"MONDO:99{i:05d}" for i in range(600)]
+    result = run(get_normalized_nodes.fn(curies, return_json=True))
+    assert list(result) == curies
+    assert [len(batch) for batch in sent_requests] == [250, 250, 100]
+
+
+def test_concurrent_calls_are_coalesced(run, sent_requests):
+    """Test concurrent calls within the coalescing window share one upstream request"""
+    curies = ["MONDO:0005148", "CHEBI:15365", "NCBIGene:672", "MESH:D014867", UNKNOWN]
+
+    async def call_concurrently():
+        return await asyncio.gather(*(
+            get_normalized_nodes.fn([curie, "MONDO:0005148"], return_json=True) for curie in curies
+        ))
+
+    results = run(call_concurrently())
+    assert len(sent_requests) == 1
+    assert sorted(sent_requests[0]) == sorted(curies)
+    for curie, result in zip(curies, results):
+        assert set(result) == {curie, "MONDO:0005148"}
+
+
+def test_repeated_calls_hit_the_cache(run, sent_requests):
+    """Test a CURIE seen before, with the same flags, is answered without an upstream request"""
+    first = run(get_normalized_nodes.fn(["MONDO:0005148", UNKNOWN], return_json=True))
+    second = run(get_normalized_nodes.fn(["MONDO:0005148", UNKNOWN], return_json=True))
+    assert first == second
+    assert len(sent_requests) == 1
+
+    # Different flags are cached separately
+    run(get_normalized_nodes.fn(["MONDO:0005148"], conflate=False, return_json=True))
+    assert len(sent_requests) == 2
+
+
+def test_json_result_does_not_alias_the_cache(run, sent_requests):
+    """Test mutating a return_json result leaves later results unchanged"""
+    result = run(get_normalized_nodes.fn(["MONDO:0005148"], return_json=True))
+    result["MONDO:0005148"]["id"]["label"] = "MUTATED"
+
+    assert "MUTATED" not in run(get_normalized_nodes.fn(["MONDO:0005148"]))
+    assert run(get_normalized_nodes.fn(["MONDO:0005148"], return_json=True))["MONDO:0005148"]["id"]["label"] != "MUTATED"
+    assert len(sent_requests) == 1
+
+
+def test_failure_reaches_every_waiter(run, sent_requests, unavailable_service):
+    """Test a failed upstream request is raised to every coalesced caller and nothing is cached"""
+    async def call_concurrently():
+        return await asyncio.gather(
+            *(get_normalized_nodes.fn([f"MONDO:000514{i}"], return_json=True) for i in range(5)),
+            return_exceptions=True
+        )
+
+    results = run(call_concurrently())
+    assert len(sent_requests) == 1
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+
+    # Nothing from the failed request is cached or left in flight
+    with pytest.raises(httpx.HTTPStatusError):
+        run(get_normalized_nodes.fn(["MONDO:0005140"], return_json=True))
+    assert len(sent_requests) == 2
+
+
+def test_cancelled_caller_does_not_cancel_others(run, sent_requests):
+    """Test cancelling one caller leaves the shared upstream request running for the rest"""
+    async def cancel_one_caller():
+        first = asyncio.create_task(get_normalized_nodes.fn(["MONDO:0005148"], return_json=True))
+        second = asyncio.create_task(get_normalized_nodes.fn(["MONDO:0005148"], return_json=True))
+        # Cancel once the shared request has gone out, before its response arrives
+        while not sent_requests:
+            await asyncio.sleep(0.001)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert run(cancel_one_caller())["MONDO:0005148"]["id"]["identifier"] == "MONDO:0005148"
+    assert len(sent_requests) == 1
+
+    # The shared request still filled the cache
+    run(get_normalized_nodes.fn(["MONDO:0005148"], return_json=True))
+    assert len(sent_requests) == 1
+
+
+def test_sequential_sessions_share_http_client(run, sent_requests):
+    """Test a second MCP session can still call upstream after the first one ends"""
+    async def call_in_new_session(curie):
+        async with Client(mcp) as client:
+            result = await client.call_tool("get_normalized_nodes", {"curies": [curie], "return_json": True})
+            return result.data
+
+    # Different CURIEs so neither call is answered from the cache
+    assert run(call_in_new_session("MONDO:0005148"))["MONDO:0005148"]["id"]["identifier"] == "MONDO:0005148"
+    assert run(call_in_new_session("MONDO:0005015"))["MONDO:0005015"]["id"]["identifier"] == "MONDO:0005015"
+    assert len(sent_requests) == 2